@@ -1,7 +1,16 @@
 import pandas as pd
 import numpy as np
 import json
-from itertools import permutations, combinations, product
+
+# Numba is optional: without it the kernels below run as plain Python
+try:
+    from numba import njit, prange
+except ImportError:
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
 
 # Load input data from JSON file
 with open("input.json", "r") as file:
@@ -32,183 +41,209 @@ drones_df.rename(columns={
 drones_df = drones_df[drones_df['available']].reset_index(drop=True)
 
 # Generate all possible order combinations and their permutations
-order_ids = orders_df['ID'].tolist()
-all_combos_perms = []
-for r in range(1, len(order_ids) + 1):
-    for combo in combinations(order_ids, r):
-        all_combos_perms.extend(permutations(combo))
-
-# Calculate distances, weights, and constraints for each order combination
-dist_data = []
-for combo in all_combos_perms:
-    # Extract coordinates for each order in the combination
-    dist_list = [(
-        orders_df.loc[orders_df['ID'] == order, 'x'].values[0], 
-        orders_df.loc[orders_df['ID'] == order, 'y'].values[0]
-    ) for order in combo]
-    
-    # Calculate Manhattan distances
-    # 1. Distance from origin to each point
-    distance_list = [abs(x) + abs(y) for (x, y) in dist_list]
-    
-    # 2. Relative distances between consecutive points
-    relative_distance = [abs(dist_list[0][0]) + abs(dist_list[0][1])]
-    for i in range(len(dist_list) - 1):
-        x1, y1 = dist_list[i]
-        x2, y2 = dist_list[i + 1]
-        relative_distance.append(abs(x2 - x1) + abs(y2 - y1))
-    
-    # 3. Cumulative distances (progressive sum)
-    cumulative_distance = [relative_distance[0]]
-    for i in range(1, len(relative_distance)):
-        cumulative_distance.append(cumulative_distance[-1] + relative_distance[i])
-    
-    # Total round trip distance
-    total_distance = cumulative_distance[-1] + abs(dist_list[-1][0]) + abs(dist_list[-1][1])
-
-    # Calculate total package weight
-    total_weight = sum(orders_df.loc[orders_df['ID'].isin(combo), 'weight'])
-
-    # Extract order delivery times
-    time_list = orders_df.loc[orders_df['ID'].isin(combo), 'time'].tolist()
-
-    # Check drone-specific constraints
-    drone_columns = {}
-    for _, drone in drones_df.iterrows():
-        drone_id = drone['Drone_ID']
-        max_payload = drone['max_payload']
-        max_dist = drone['max_dist']
-        speed = drone['speed']
-
-        # Weight constraint check
-        weight_check = 1 if total_weight <= max_payload else 0
-        
-        # Distance constraint check
-        distance_check = 1 if total_distance <= max_dist else 0
-        
-        # Delivery time constraint check
-        delivery_time_check = 1 if all(
-            time >= cum_dist / speed 
-            for time, cum_dist in zip(time_list, cumulative_distance)
-        ) else 0
-
-        # Overall feasibility for this drone
-        overall_check = 1 if (weight_check and distance_check and delivery_time_check) else 0
-
-        # Store constraint results
-        drone_columns.update({
-            f'drone_{drone_id}_weight': weight_check,
-            f'drone_{drone_id}_distance': distance_check,
-            f'drone_{drone_id}_delivery_time_constraints': delivery_time_check,
-            f'drone_{drone_id}_overall': overall_check
-        })
-
-    # Append combination details
-    dist_data.append({
-        'Order_Combos': combo, 
-        'dist_list': dist_list, 
-        'distance_list': distance_list,
-        'relative_distance': relative_distance,
-        'cumulative_distance': cumulative_distance,
-        'total_distance': total_distance,
-        'weight': total_weight,
-        'time': time_list,
-        **drone_columns
-    })
-
-# Create DataFrame from calculated distances and constraints
-order_data_df = pd.DataFrame(dist_data)
+# - Orders are stored as 0-based positions in an int16 matrix, one row per route
+# - Row i holds a route of combo_lengths[i] orders, padded with -1
+@njit(cache=True)
+def index_combinations(n, r):
+    # All r-element combinations of 0..n-1 in lexicographic order
+    count = 1
+    for i in range(r):
+        count = count * (n - i) // (i + 1)
+    combos = np.empty((count, r), dtype=np.int16)
+    idx = np.arange(r)
+    for row in range(count):
+        combos[row] = idx
+        i = r - 1
+        while i >= 0 and idx[i] == n - r + i:
+            i -= 1
+        if i < 0:
+            break
+        idx[i] += 1
+        for j in range(i + 1, r):
+            idx[j] = idx[j - 1] + 1
+    return combos
+
+@njit(cache=True)
+def heap_permutations(r):
+    # All r! orderings of 0..r-1 using the iterative form of Heap's algorithm
+    count = 1
+    for i in range(2, r + 1):
+        count *= i
+    perms = np.empty((count, r), dtype=np.int16)
+    a = np.arange(r)
+    c = np.zeros(r, dtype=np.int64)
+    perms[0] = a
+    row = 1
+    i = 1
+    while i < r:
+        if c[i] < i:
+            j = 0 if i % 2 == 0 else c[i]
+            a[j], a[i] = a[i], a[j]
+            perms[row] = a
+            row += 1
+            c[i] += 1
+            i = 1
+        else:
+            c[i] = 0
+            i += 1
+    return perms
+
+n_orders = len(orders_df)
+blocks = []
+for r in range(1, n_orders + 1):
+    # Apply every ordering to every combination of size r
+    block = index_combinations(n_orders, r)[:, heap_permutations(r)].reshape(-1, r)
+    padded = np.full((len(block), n_orders), -1, dtype=np.int16)
+    padded[:, :r] = block
+    blocks.append(padded)
+combos_matrix = np.concatenate(blocks)
+combo_lengths = (combos_matrix >= 0).sum(axis=1)
+
+# Encode each combination's set of orders as a bitmask (bit k = order k + 1)
+combo_masks = np.where(combos_matrix >= 0, np.left_shift(1, np.maximum(combos_matrix, 0).astype(np.int64)), 0).sum(axis=1)
+
+# Extract order attributes as NumPy arrays once
+# - Order IDs run from 1 to N, so ID - 1 is the array position
+# - Both coordinates share one dtype, so float distances are never truncated to int
+coord_dtype = np.result_type(orders_df['x'].to_numpy(), orders_df['y'].to_numpy())
+xs = orders_df['x'].to_numpy(dtype=coord_dtype)
+ys = orders_df['y'].to_numpy(dtype=coord_dtype)
+weights = orders_df['weight'].to_numpy()
+times = orders_df['time'].to_numpy()
+order_names = orders_df['id'].to_numpy()
+
+# Extract drone limits as NumPy arrays once
+# - Distances keep the coordinate dtype, so integer grids give exact integer sums
+# - Speeds stay float64, since float32 rounding could let a too-slow drone pass the
+#   deadline check or tie two different Total_Time values
+drone_payloads = drones_df['max_payload'].to_numpy()
+drone_maxdists = drones_df['max_dist'].to_numpy()
+drone_speeds = drones_df['speed'].to_numpy(dtype=np.float64)
+
+# Calculate distances, weights and deadline requirements for every order combination
+# - Manhattan distances are accumulated stop by stop from the origin
+# - required_speed is the slowest speed that still meets every deadline on the route
+# - Combinations are independent, so they are spread across CPU cores
+@njit(parallel=True, cache=True)
+def evaluate_combos(xs, ys, weights, times, combos_matrix, combo_lengths):
+    n_combos = combos_matrix.shape[0]
+    last_cum = np.empty(n_combos, dtype=xs.dtype)
+    total_distance = np.empty(n_combos, dtype=xs.dtype)
+    total_weight = np.empty(n_combos, dtype=weights.dtype)
+    required_speed = np.zeros(n_combos)
+
+    for i in prange(n_combos):
+        route = combos_matrix[i, :combo_lengths[i]]
+
+        # Walk the route from the origin, tracking the previous stop
+        prev_x = xs.dtype.type(0)
+        prev_y = ys.dtype.type(0)
+        cum_dist = xs.dtype.type(0)
+        weight = weights.dtype.type(0)
+        for j in range(len(route)):
+            order = route[j]
+            step = abs(xs[order] - prev_x) + abs(ys[order] - prev_y)
+            cum_dist += step
+            weight += weights[order]
+            prev_x = xs[order]
+            prev_y = ys[order]
+
+            # Speed needed to reach this stop by its deadline
+            if times[order] > 0:
+                speed = cum_dist / times[order]
+            elif times[order] == 0 and cum_dist == 0:
+                speed = 0.0
+            else:
+                speed = np.inf
+            required_speed[i] = max(required_speed[i], speed)
+
+        # Distance to the last stop, then the round trip back to the origin
+        last_cum[i] = cum_dist
+        total_distance[i] = cum_dist + abs(prev_x) + abs(prev_y)
+        total_weight[i] = weight
+
+    return last_cum, total_distance, total_weight, required_speed
+
+last_cum, total_distance, total_weight, required_speed = evaluate_combos(xs, ys, weights, times, combos_matrix, combo_lengths)
+
+# Check drone-specific constraints for all combinations at once
+# - overall_check[i, k] is True when drone k can fly order combination i
+# - Each drone's column is filled separately to avoid (n_combos, n_drones) temporaries
+overall_check = np.empty((len(total_weight), len(drones_df)), dtype=np.bool_)
+for k in range(len(drones_df)):
+    overall_check[:, k] = (
+        (total_weight <= drone_payloads[k])
+        & (total_distance <= drone_maxdists[k])
+        & (required_speed <= drone_speeds[k])
+    )
 
 # Generate all possible drone assignments
-# - Create lists of valid order combinations for each drone
-# - Add a 0 placeholder for "no assignment"
+# - Create lists of valid combination indices (with their bitmasks) for each drone
+# - Add a -1 placeholder with an empty mask for "no assignment"
 combos_lists = []
-for drone in drones_df['Drone_ID']:
-    valid_combos = list(order_data_df[order_data_df[f'drone_{drone}_overall'] == 1]['Order_Combos'])
-    combos_lists.append(valid_combos + [0])
-
-# Generate all possible drone assignment combinations
-all_combinations = list(product(*combos_lists))
-
-# Validate drone assignments to ensure no order is assigned multiple times
-def is_valid_combination(combination):
-    orders = set()
-    for combo in combination:
-        if combo == 0:  # Ignore placeholder
-            continue
-        for order in combo:
-            if order in orders:
-                return False  # Order is repeated
-            orders.add(order)
-    return True
-
-# Filter out invalid combinations
-valid_combinations = [combo for combo in all_combinations if is_valid_combination(combo)]
-
-# Create DataFrame with valid combinations
-valid_combos_df = pd.DataFrame(valid_combinations, columns=[f'drone_{drone}' for drone in drones_df['Drone_ID']])
-valid_combos_df.insert(0, 'Valid_combinations', valid_combos_df.apply(tuple, axis=1))
-
-# Function to retrieve metrics for each drone's order combination
-def get_drone_metrics(combo, column_name):
-    return 0 if combo == 0 else order_data_df.loc[order_data_df['Order_Combos'] == combo, column_name].values[0]
-
-# Extract detailed metrics for each drone's order combination
-for drone in drones_df['Drone_ID']:
-    valid_combos_df[f'drone_{drone}_weight'] = valid_combos_df[f'drone_{drone}'].apply(lambda x: get_drone_metrics(x, 'weight'))
-    valid_combos_df[f'drone_{drone}_order_coord'] = valid_combos_df[f'drone_{drone}'].apply(lambda x: get_drone_metrics(x, 'dist_list'))
-    valid_combos_df[f'drone_{drone}_distance'] = valid_combos_df[f'drone_{drone}'].apply(lambda x: get_drone_metrics(x, 'distance_list'))
-    valid_combos_df[f'drone_{drone}_relative_distance'] = valid_combos_df[f'drone_{drone}'].apply(lambda x: get_drone_metrics(x, 'relative_distance'))
-    valid_combos_df[f'drone_{drone}_cumulative_distance'] = valid_combos_df[f'drone_{drone}'].apply(lambda x: get_drone_metrics(x, 'cumulative_distance'))
-    valid_combos_df[f'drone_{drone}_total_distance'] = valid_combos_df[f'drone_{drone}'].apply(lambda x: get_drone_metrics(x, 'total_distance'))
-
-# Function to extract the last value from a list
-def get_last_value(value):
-    return value[-1] if isinstance(value, list) and value else 0
-
-# Calculate total time for each drone based on speed
-for drone, speed in zip(drones_df['Drone_ID'], drones_df['speed']):
-    valid_combos_df[f'drone_{drone}_total_time'] = (
-        valid_combos_df[f'drone_{drone}_cumulative_distance'].apply(get_last_value) / speed
-    )
-
-# Calculate total time and total distance across all drones
-valid_combos_df["Total_Time"] = valid_combos_df[[f'drone_{drone}_total_time' for drone in drones_df["Drone_ID"]]].sum(axis=1)
-valid_combos_df["Total_Distance"] = valid_combos_df[[f'drone_{drone}_total_distance' for drone in drones_df["Drone_ID"]]].sum(axis=1)
-
-# Get all unique order IDs
-all_order_ids = set(orders_df["ID"])
-
-# Function to check if all orders are assigned
-def check_all_orders_present(combination):
-    combo_orders = set()
-    for drone_combo in combination:
-        if drone_combo != 0:  # Ignore empty assignments
-            combo_orders.update(drone_combo)
-    return 1 if combo_orders == all_order_ids else 0
-
-# Flag combinations that include all orders
-valid_combos_df["contains_all_orders"] = valid_combos_df["Valid_combinations"].apply(check_all_orders_present)
-
-# Function to count total unique orders in a combination
-def count_orders(combination):
-    combo_orders = set()
-    for drone_combo in combination:
-        if drone_combo != 0:  # Ignore empty assignments
-            combo_orders.update(drone_combo)
-    return len(combo_orders)
-
-# Add order count column
-valid_combos_df["count"] = valid_combos_df["Valid_combinations"].apply(count_orders)
-
-# Sort combinations by total time
-valid_combos_df = valid_combos_df.sort_values(by="Total_Time", ascending=True).reset_index(drop=True)
+for k in range(len(drones_df)):
+    valid_idx = np.flatnonzero(overall_check[:, k])
+    combos_lists.append(list(zip(valid_idx.tolist(), combo_masks[valid_idx].tolist())) + [(-1, 0)])
+
+# Assign combinations drone by drone, skipping any that repeat an order
+# - used_mask holds the orders already taken by earlier drones
+# - Each complete assignment is appended to out as a tuple of combination indices
+def assign_drones(combos_lists, out, i=0, used_mask=0, partial=None):
+    if partial is None:
+        partial = []
+    if i == len(combos_lists):
+        out.append(tuple(partial))
+        return out
+    for combo_idx, mask in combos_lists[i]:
+        if not used_mask & mask:
+            partial.append(combo_idx)
+            assign_drones(combos_lists, out, i + 1, used_mask | mask, partial)
+            partial.pop()
+    return out
+
+valid_assignments = assign_drones(combos_lists, [])
+assignment_matrix = np.array(valid_assignments)
+assigned = assignment_matrix >= 0
+picked = np.where(assigned, assignment_matrix, 0)
+
+# Per-drone metrics for every assignment (rows are assignments, columns are drones)
+# - Unassigned drones get 0 for every metric
+# - Total time is the distance to the last stop over the drone's speed
+weight_mat = np.where(assigned, total_weight[picked], 0)
+total_distance_mat = np.where(assigned, total_distance[picked], 0)
+total_time_mat = np.where(assigned, last_cum[picked], 0) / drone_speeds
+
+# Combine the order bitmasks of every drone in each assignment
+# - Drones never share an order, so summing masks and lengths is exact
+assignment_masks = np.where(assigned, combo_masks[picked], 0).sum(axis=1)
+order_counts = np.where(assigned, combo_lengths[picked], 0).sum(axis=1)
+full_mask = (1 << n_orders) - 1
+
+# Collect every column of the valid combinations, then build the DataFrame once
+# - The coverage flag and order count are stored as bool/int16, and per-drone times as
+#   float32, which keeps these per-assignment columns small when there are many assignments
+# - Total_Time is the selection key, so it is summed from the float64 times
+# - Row i is assignment_matrix[i]; routes are only mapped back to orders for the chosen row
+drone_ids = drones_df['Drone_ID'].tolist()
+valid_data = {}
+for k, drone in enumerate(drone_ids):
+    valid_data[f'drone_{drone}_weight'] = weight_mat[:, k]
+    valid_data[f'drone_{drone}_total_distance'] = total_distance_mat[:, k]
+for k, drone in enumerate(drone_ids):
+    valid_data[f'drone_{drone}_total_time'] = total_time_mat[:, k].astype(np.float32)
+valid_data.update({
+    'Total_Time': total_time_mat.sum(axis=1),
+    'Total_Distance': total_distance_mat.sum(axis=1),
+    'contains_all_orders': assignment_masks == full_mask,
+    'count': order_counts.astype(np.int16),
+})
+valid_combos_df = pd.DataFrame(valid_data)
 
 # Select optimal combination
 # Priority 1: Combinations covering all orders with least total time
 # Priority 2: Combinations with maximum order coverage and least total time
-if (valid_combos_df["contains_all_orders"] == 1).any():
-    final_output = valid_combos_df[valid_combos_df["contains_all_orders"] == 1].nsmallest(1, "Total_Time")
+if valid_combos_df["contains_all_orders"].any():
+    final_output = valid_combos_df[valid_combos_df["contains_all_orders"]].nsmallest(1, "Total_Time")
 else:
     max_count = valid_combos_df["count"].max()
     final_output = valid_combos_df[valid_combos_df["count"] == max_count].nsmallest(1, "Total_Time")
@@ -216,14 +251,13 @@ else:
 drone_list = []
 order_list = []
 distance_list = []
-for drone,id in zip(list(drones_df['Drone_ID']), list(drones_df['id'])):
-    orders = list(final_output[f'drone_{drone}'])[0]
+best_row = final_output.index[0]
+for k, (drone, id) in enumerate(zip(list(drones_df['Drone_ID']), list(drones_df['id']))):
+    # Route of the chosen combination as order positions (-1 means no assignment)
+    combo_idx = assignment_matrix[best_row, k]
     orders_1 = []
-    if orders == 0:
-         orders_1 = []
-    else:
-        for order in orders:
-            orders_1.append(list(orders_df[orders_df['ID'] == order]['id'])[0])
+    if combo_idx >= 0:
+        orders_1 = order_names[combos_matrix[combo_idx, :combo_lengths[combo_idx]]].tolist()
     order_list.append(orders_1)
     distance_list.append(list(final_output[f'drone_{drone}_total_distance'])[0])
     drone_list.append(id)